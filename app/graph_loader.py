@@ -2,17 +2,157 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from rdflib import Graph
+import os
+import pickle
+import shutil
+
+from rdflib import Graph, Namespace, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.namespace import RDF, RDFS
+from rdflib.plugin import PluginException
+from rdflib.plugins.sparql import CUSTOM_EVALS, prepareQuery
+from rdflib.plugins.sparql.evaluate import evalBGP
+from rdflib.plugins.sparql.sparql import Query
 
 
 REC_NS = "http://example.org/recipes#"
 SCHEMA_NS = "http://schema.org/"
 RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
 
+REC = Namespace(REC_NS)
+SCHEMA = Namespace(SCHEMA_NS)
+
+# Prepared once at import so no request (or load) pays the pyparsing cost
+# of re-parsing the SPARQL text. recipe_detail and search no longer go
+# through SPARQL at all, so these two vocabulary queries are all that is
+# left to prepare.
+_LIST_NS = {"rec": REC_NS, "rdfs": RDFS_NS}
+
+_Q_LIST_CUISINES = prepareQuery(
+    """
+    SELECT DISTINCT ?label WHERE {
+        ?cuisine a rec:Cuisine ;
+                 rdfs:label ?label .
+    }
+    """,
+    initNs=_LIST_NS,
+)
+
+_Q_LIST_DIETS = prepareQuery(
+    """
+    SELECT DISTINCT ?label WHERE {
+        ?diet a rec:DietType ;
+              rdfs:label ?label .
+    }
+    """,
+    initNs=_LIST_NS,
+)
+
+
+def eval_recipe_bgp(ctx, part):
+    """Evaluate recipe-shaped BGPs with the recipe anchor pattern first.
+
+    rdflib's default evaluator probes a BGP's triple patterns in written
+    order, which can enumerate huge intermediate bindings before the
+    ``?recipe a rec:Recipe`` anchor narrows them down. Reorder so the anchor
+    runs first and all patterns sharing its subject follow immediately,
+    turning the evaluation into one subject-indexed sweep per recipe.
+    Non-recipe BGPs fall through to the default evaluator.
+    """
+
+    if part.name != "BGP":
+        raise NotImplementedError
+    anchors = [t for t in part.triples if t[1] == RDF.type and t[2] == REC.Recipe]
+    if not anchors:
+        raise NotImplementedError
+    rest = [t for t in part.triples if t not in anchors]
+    subjects = {t[0] for t in anchors}
+    subject_bound = [t for t in rest if t[0] in subjects]
+    chained = [t for t in rest if t[0] not in subjects]
+    return evalBGP(ctx, anchors + subject_bound + chained)
+
+
+CUSTOM_EVALS["recipe_bgp"] = eval_recipe_bgp
+
+
+def _snapshot_is_fresh(snapshot: Path, ttl_path: Path) -> bool:
+    return snapshot.exists() and snapshot.stat().st_mtime >= ttl_path.stat().st_mtime
+
+
+# RocksDB allows only one open handle per database within a process, so keep
+# the pyoxigraph stores we have opened, keyed by database path.
+_OXIGRAPH_STORES: Dict[str, object] = {}
+
+
+def _open_oxigraph_graph(ttl_path: Path) -> Graph:
+    """Open the graph from a persistent Oxigraph database next to the TTL.
+
+    Parsing Turtle dominates startup cost, so the TTL is bulk-loaded into an
+    on-disk Oxigraph store on first boot; later boots just open the database,
+    which is O(1) regardless of graph size. A stale database (older than the
+    TTL) is cleared and rebuilt.
+    """
+
+    import pyoxigraph
+    from oxrdflib import OxigraphStore
+
+    db_path = ttl_path.with_name(ttl_path.name + ".oxdb")
+    fresh = _snapshot_is_fresh(db_path, ttl_path)
+    store = _OXIGRAPH_STORES.get(str(db_path))
+    if store is None:
+        if not fresh and db_path.exists():
+            shutil.rmtree(db_path)
+        store = pyoxigraph.Store(str(db_path))
+        _OXIGRAPH_STORES[str(db_path)] = store
+        if not fresh:
+            store.bulk_load(path=str(ttl_path), format=pyoxigraph.RdfFormat.TURTLE)
+    elif not fresh:
+        store.clear()
+        store.bulk_load(path=str(ttl_path), format=pyoxigraph.RdfFormat.TURTLE)
+    if not fresh:
+        store.flush()
+        os.utime(db_path)
+    return Graph(store=OxigraphStore(store=store), identifier=DATASET_DEFAULT_GRAPH_ID)
+
+
+def _open_pickled_graph(ttl_path: Path) -> Graph:
+    """Fallback snapshot for the pure-Python store: pickle the parsed graph."""
+    cache_path = ttl_path.with_name(ttl_path.name + ".pickle")
+    if _snapshot_is_fresh(cache_path, ttl_path):
+        try:
+            with cache_path.open("rb") as handle:
+                return pickle.load(handle)
+        except Exception:
+            pass  # corrupt or incompatible snapshot; re-parse below
+    graph = Graph()
+    graph.parse(ttl_path, format="turtle")
+    try:
+        with cache_path.open("wb") as handle:
+            pickle.dump(graph, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # read-only data directory; caching is best-effort
+    return graph
+
+
+def _open_graph(ttl_path: Path) -> Graph:
+    """Open the recipe graph, preferring the native Oxigraph store.
+
+    The Oxigraph store (provided by ``oxrdflib``) evaluates SPARQL against
+    Rust-backed triple indexes, which is dramatically faster than rdflib's
+    pure-Python in-memory store. If the plugin is not installed we fall back
+    to the default store so the application keeps working. Either way the
+    parsed graph is snapshotted on disk so the Turtle parser only runs when
+    the TTL actually changes.
+    """
+
+    try:
+        return _open_oxigraph_graph(ttl_path)
+    except (ImportError, PluginException):
+        return _open_pickled_graph(ttl_path)
+
 
 @dataclass
 class RecipeSummary:
@@ -37,40 +177,88 @@ class RecipeGraph:
     def __init__(self, ttl_path: Path) -> None:
         if not ttl_path.exists():
             raise FileNotFoundError(f"Knowledge graph not found at {ttl_path}")
-        self.graph = Graph()
-        self.graph.parse(ttl_path, format="turtle")
+        self.graph = _open_graph(ttl_path)
+        # The vocabulary is static for the lifetime of the graph, so pay the
+        # SPARQL cost once here instead of on every request.
+        self._cuisines = sorted(self.list_cuisines())
+        self._diets = sorted(self.list_diets())
+        self._ingredient_index = self._build_ingredient_index()
+        self._cuisine_uris = self._build_label_lookup(REC.Cuisine)
+        self._diet_uris = self._build_label_lookup(REC.DietType)
+
+    def _build_label_lookup(self, rdf_class: URIRef) -> Dict[str, List[URIRef]]:
+        """Map each lowercased label to the nodes of ``rdf_class`` bearing it."""
+        lookup: Dict[str, List[URIRef]] = {}
+        for node in self.graph.subjects(RDF.type, rdf_class):
+            label = self.graph.value(node, RDFS.label)
+            if label is not None:
+                lookup.setdefault(str(label).lower(), []).append(node)
+        return lookup
 
-    def _execute(self, query: str, **params) -> List[Dict[str, str]]:
+    def _build_ingredient_index(self) -> Dict[str, Set[URIRef]]:
+        """Map each lowercased ingredient label to the recipes using it.
+
+        Built once at load time so the ingredient filter in :meth:`search`
+        scans a few thousand distinct labels in Python instead of asking
+        SPARQL to run LCASE+CONTAINS over every hasIngredient triple.
+        """
+
+        index: Dict[str, Set[URIRef]] = {}
+        for recipe, ingredient in self.graph.subject_objects(REC.hasIngredient):
+            label = self.graph.value(ingredient, RDFS.label)
+            if label is not None:
+                index.setdefault(str(label).lower(), set()).add(recipe)
+        return index
+
+    def _ingredient_candidates(self, ingredient: str) -> Set[URIRef]:
+        """Recipes whose ingredient labels contain ``ingredient`` (case-insensitive)."""
+        needle = ingredient.lower()
+        candidates: Set[URIRef] = set()
+        for label, recipes in self._ingredient_index.items():
+            if needle in label:
+                candidates |= recipes
+        return candidates
+
+    def _recipes_by_label(
+        self,
+        predicate: URIRef,
+        label_lookup: Dict[str, List[URIRef]],
+        label: str,
+    ) -> Set[URIRef]:
+        """Recipes linked via ``predicate`` to a node labelled ``label``."""
+        recipes: Set[URIRef] = set()
+        for node in label_lookup.get(label.lower(), ()):
+            recipes.update(self.graph.subjects(predicate, node))
+        return recipes
+
+    @property
+    def cuisines(self) -> List[str]:
+        """All cuisine labels, sorted, computed once at load time."""
+        return self._cuisines
+
+    @property
+    def diets(self) -> List[str]:
+        """All diet labels, sorted, computed once at load time."""
+        return self._diets
+
+    def _execute(self, query: Query, **params) -> List[Dict[str, str]]:
         results = self.graph.query(query, initBindings=params)
-        output: List[Dict[str, str]] = []
-        for row in results:
-            row_dict = {str(var): (value.toPython() if value is not None else None) for var, value in row.asdict().items()}
-            output.append(row_dict)
-        return output
+        # The projected variable names are fixed by the query, so compute them
+        # once instead of re-stringifying them for every row.
+        variables = [str(var) for var in results.vars]
+        return [
+            {
+                var: (value.toPython() if value is not None else None)
+                for var, value in zip(variables, row)
+            }
+            for row in results
+        ]
 
     def list_cuisines(self) -> List[str]:
-        query = f"""
-        PREFIX rec: <{REC_NS}>
-        PREFIX rdfs: <{RDFS_NS}>
-        SELECT DISTINCT ?label WHERE {{
-            ?cuisine a rec:Cuisine ;
-                     rdfs:label ?label .
-        }}
-        ORDER BY LCASE(?label)
-        """
-        return [row["label"] for row in self._execute(query)]
+        return [row["label"] for row in self._execute(_Q_LIST_CUISINES)]
 
     def list_diets(self) -> List[str]:
-        query = f"""
-        PREFIX rec: <{REC_NS}>
-        PREFIX rdfs: <{RDFS_NS}>
-        SELECT DISTINCT ?label WHERE {{
-            ?diet a rec:DietType ;
-                  rdfs:label ?label .
-        }}
-        ORDER BY LCASE(?label)
-        """
-        return [row["label"] for row in self._execute(query)]
+        return [row["label"] for row in self._execute(_Q_LIST_DIETS)]
 
     def search(
         self,
@@ -78,150 +266,131 @@ class RecipeGraph:
         cuisine: Optional[str] = None,
         diet: Optional[str] = None,
         max_total_time: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[RecipeSummary]:
-        # Build query with direct string substitution to avoid parameter binding issues
-        where_parts = [
-            "?recipe a rec:Recipe ;",
-            "        rdfs:label ?label .",
-            "OPTIONAL { ?recipe schema:url ?url . }",
-            "OPTIONAL { ?recipe rec:hasRating ?rating . }",
-            "OPTIONAL { ?recipe rec:hasTotalTime ?totalTime . }",
-            "OPTIONAL { ?recipe rec:hasCuisine ?cuisine . ?cuisine rdfs:label ?cuisineLabel . }",
-            "OPTIONAL { ?recipe rec:hasDiet ?diet . ?diet rdfs:label ?dietLabel . }",
-        ]
-
-        filter_parts = []
-        
+        # The search shape is fixed, so evaluate it as an explicit join over
+        # the triple indexes instead of going through the SPARQL engine:
+        # intersect the (small) per-filter candidate sets first, then pull
+        # each surviving recipe's properties in one subject-indexed sweep.
+        candidate_sets: List[Set[URIRef]] = []
         if ingredient:
-            where_parts.append("?recipe rec:hasIngredient ?ingredient .")
-            where_parts.append("?ingredient rdfs:label ?ingredientLabel .")
-            filter_parts.append(f'FILTER(CONTAINS(LCASE(?ingredientLabel), LCASE("{ingredient}")))')
-            
+            candidate_sets.append(self._ingredient_candidates(ingredient))
         if cuisine:
-            where_parts.append("?recipe rec:hasCuisine ?cuisineFilterUri .")
-            where_parts.append("?cuisineFilterUri rdfs:label ?cuisineLabelFilter .")
-            filter_parts.append(f'FILTER(LCASE(?cuisineLabelFilter) = LCASE("{cuisine}"))')
-            
+            candidate_sets.append(self._recipes_by_label(REC.hasCuisine, self._cuisine_uris, cuisine))
         if diet:
-            where_parts.append("?recipe rec:hasDiet ?dietFilterUri .")
-            where_parts.append("?dietFilterUri rdfs:label ?dietLabelFilter .")
-            filter_parts.append(f'FILTER(LCASE(?dietLabelFilter) = LCASE("{diet}"))')
-            
-        if max_total_time is not None:
-            filter_parts.append(f'FILTER(xsd:integer(?totalTime) <= {max_total_time})')
-
-        where_block = "\n".join(where_parts)
-        filter_block = "\n".join(filter_parts)
-        
-        query = f"""
-        PREFIX rec: <{REC_NS}>
-        PREFIX schema: <{SCHEMA_NS}>
-        PREFIX rdfs: <{RDFS_NS}>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-        SELECT ?recipe ?label ?url ?rating ?totalTime ?cuisineLabel ?dietLabel
-        WHERE {{
-            {where_block}
-            {filter_block}
-        }}
-        ORDER BY LCASE(?label)
-        """
+            candidate_sets.append(self._recipes_by_label(REC.hasDiet, self._diet_uris, diet))
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            recipes = set.intersection(*candidate_sets)
+        else:
+            recipes = set(self.graph.subjects(RDF.type, REC.Recipe))
 
-        rows = self.graph.query(query)
         summaries: List[RecipeSummary] = []
-        
-        # Group results by recipe URI to collect cuisines and diets
-        recipe_data = {}
-        for row in rows:
-            recipe_uri = str(row["recipe"])
-            if recipe_uri not in recipe_data:
-                recipe_data[recipe_uri] = {
-                    "uri": recipe_uri,
-                    "label": str(row["label"]),
-                    "url": str(row["url"]) if row["url"] else None,
-                    "rating": row["rating"].toPython() if row["rating"] else None,
-                    "total_time": row["totalTime"].toPython() if row["totalTime"] else None,
-                    "cuisines": set(),
-                    "diets": set()
-                }
-            
-            # Add cuisine if present
-            if row["cuisineLabel"]:
-                recipe_data[recipe_uri]["cuisines"].add(str(row["cuisineLabel"]))
-            
-            # Add diet if present
-            if row["dietLabel"]:
-                recipe_data[recipe_uri]["diets"].add(str(row["dietLabel"]))
-        
-        # Convert to RecipeSummary objects
-        for recipe_uri, data in recipe_data.items():
+        for recipe in recipes:
+            total_time = self.graph.value(recipe, REC.hasTotalTime)
+            if max_total_time is not None and (
+                total_time is None or total_time.toPython() > max_total_time
+            ):
+                continue
+            label = self.graph.value(recipe, RDFS.label)
+            if label is None:
+                continue
+            url = self.graph.value(recipe, SCHEMA.url)
+            rating = self.graph.value(recipe, REC.hasRating)
             summaries.append(
                 RecipeSummary(
-                    uri=data["uri"],
-                    label=data["label"],
-                    url=data["url"],
-                    rating=data["rating"],
-                    total_time=data["total_time"],
-                    cuisines=list(data["cuisines"]),
-                    diets=list(data["diets"]),
+                    uri=str(recipe),
+                    label=str(label),
+                    url=str(url) if url else None,
+                    rating=rating.toPython() if rating else None,
+                    total_time=total_time.toPython() if total_time else None,
+                    cuisines=self._object_labels(recipe, REC.hasCuisine),
+                    diets=self._object_labels(recipe, REC.hasDiet),
                 )
             )
-        
+
+        summaries.sort(key=lambda summary: summary.label.lower())
+        # Paginate after grouping: a SPARQL LIMIT would count raw rows, of
+        # which each recipe contributes one per cuisine/diet combination.
+        if offset:
+            summaries = summaries[offset:]
+        if limit is not None:
+            summaries = summaries[:limit]
         return summaries
 
+    def _object_labels(self, subject: URIRef, predicate: URIRef) -> List[str]:
+        """Collect the rdfs:label of every object linked via ``predicate``."""
+        labels: List[str] = []
+        for obj in self.graph.objects(subject, predicate):
+            label = self.graph.value(obj, RDFS.label)
+            if label is not None:
+                labels.append(str(label))
+        return labels
+
     def recipe_detail(self, recipe_uri: str) -> Optional[RecipeDetail]:
-        query = f"""
-        PREFIX rec: <{REC_NS}>
-        PREFIX schema: <{SCHEMA_NS}>
-        PREFIX rdfs: <{RDFS_NS}>
-        SELECT ?label ?url ?rating ?totalTime ?ingredientLabel ?direction ?dietLabel ?cuisineLabel WHERE {{
-            BIND(<{recipe_uri}> AS ?recipe)
-            ?recipe rdfs:label ?label .
-            OPTIONAL {{ ?recipe schema:url ?url . }}
-            OPTIONAL {{ ?recipe rec:hasRating ?rating . }}
-            OPTIONAL {{ ?recipe rec:hasTotalTime ?totalTime . }}
-            OPTIONAL {{ ?recipe rec:hasIngredient ?ingredient . ?ingredient rdfs:label ?ingredientLabel . }}
-            OPTIONAL {{ ?recipe schema:step ?step . ?step rdfs:label ?direction . }}
-            OPTIONAL {{ ?recipe rec:hasDiet ?diet . ?diet rdfs:label ?dietLabel . }}
-            OPTIONAL {{ ?recipe rec:hasCuisine ?cuisine . ?cuisine rdfs:label ?cuisineLabel . }}
-        }}
-        """
-        rows = list(self.graph.query(query))
-        if not rows:
+        # A recipe is a simple star shape around its URI, so walk the triple
+        # index directly instead of paying for a multi-OPTIONAL SPARQL query
+        # whose row Cartesian product then needs de-duplicating in Python.
+        recipe = URIRef(recipe_uri)
+        label = self.graph.value(recipe, RDFS.label)
+        if label is None:
             return None
-        first = rows[0]
-        rating = first["rating"].toPython() if first["rating"] else None
-        total_time_val = first["totalTime"].toPython() if first["totalTime"] else None
-        detail = RecipeDetail(
+        url = self.graph.value(recipe, SCHEMA.url)
+        rating = self.graph.value(recipe, REC.hasRating)
+        total_time = self.graph.value(recipe, REC.hasTotalTime)
+
+        # Directions are stored inline as "NNN\ttext" literals; the prefix
+        # encodes the step position. Graphs built before rec:hasDirection
+        # existed still carry schema:step blank nodes, so fall back to those.
+        steps = []
+        for direction in self.graph.objects(recipe, REC.hasDirection):
+            position, sep, text = str(direction).partition("\t")
+            if sep and position.isdigit():
+                steps.append((int(position), text))
+            else:
+                steps.append((0, str(direction)))
+        if not steps:
+            for step in self.graph.objects(recipe, SCHEMA.step):
+                step_label = self.graph.value(step, RDFS.label)
+                if step_label is None:
+                    continue
+                position = self.graph.value(step, SCHEMA.position)
+                steps.append((position.toPython() if position is not None else 0, str(step_label)))
+        steps.sort()
+
+        return RecipeDetail(
             uri=recipe_uri,
-            label=str(first["label"]),
-            url=str(first["url"]) if first["url"] else None,
-            rating=rating,
-            total_time=total_time_val,
-            cuisines=[],
-            diets=[],
-            ingredients=[],
-            directions=[],
+            label=str(label),
+            url=str(url) if url else None,
+            rating=rating.toPython() if rating else None,
+            total_time=total_time.toPython() if total_time else None,
+            cuisines=self._object_labels(recipe, REC.hasCuisine),
+            diets=self._object_labels(recipe, REC.hasDiet),
+            ingredients=self._object_labels(recipe, REC.hasIngredient),
+            directions=[direction for _, direction in steps],
         )
-        for row in rows:
-            if row["ingredientLabel"]:
-                ingredient_label = str(row["ingredientLabel"])
-                if ingredient_label not in detail.ingredients:
-                    detail.ingredients.append(ingredient_label)
-            if row["direction"]:
-                direction = str(row["direction"])
-                if direction not in detail.directions:
-                    detail.directions.append(direction)
-            if row["dietLabel"]:
-                diet_label = str(row["dietLabel"])
-                if diet_label not in detail.diets:
-                    detail.diets.append(diet_label)
-            if row["cuisineLabel"]:
-                cuisine_label = str(row["cuisineLabel"])
-                if cuisine_label not in detail.cuisines:
-                    detail.cuisines.append(cuisine_label)
-        return detail
-
-
-@lru_cache(maxsize=1)
+
+
+_GRAPH_CACHE: Dict[Tuple[str, int], RecipeGraph] = {}
+
+
 def load_graph(ttl_path: Path) -> RecipeGraph:
-    return RecipeGraph(ttl_path)
+    """Return a cached RecipeGraph, reloading when the TTL file changes.
+
+    The cache key is the resolved path plus the file's mtime, so a rebuilt
+    TTL is picked up on the next call, two spellings of the same path share
+    one graph, and the stale graph for an older build is evicted instead of
+    lingering in memory.
+    """
+
+    resolved = ttl_path.resolve()
+    if not resolved.exists():
+        raise FileNotFoundError(f"Knowledge graph not found at {resolved}")
+    key = (resolved.as_posix(), resolved.stat().st_mtime_ns)
+    cached = _GRAPH_CACHE.get(key)
+    if cached is None:
+        for stale in [entry for entry in _GRAPH_CACHE if entry[0] == key[0]]:
+            del _GRAPH_CACHE[stale]
+        cached = _GRAPH_CACHE[key] = RecipeGraph(resolved)
+    return cached
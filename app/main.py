@@ -4,7 +4,8 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_from_directory
+import orjson
+from flask import Flask, request, send_from_directory
 
 from .config import get_graph_path
 from .graph_loader import RecipeGraph, load_graph
@@ -13,6 +14,11 @@ from .graph_loader import RecipeGraph, load_graph
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pagination bounds for /api/search; without them an unfiltered query
+# materializes and serializes the entire corpus in one response.
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+
 
 def create_app() -> Flask:
     app = Flask(__name__, static_folder=None)
@@ -26,95 +32,98 @@ def create_app() -> Flask:
         logger.error(f"Failed to load knowledge graph: {e}")
         raise
 
+    def json_response(payload, status: int = 200):
+        # orjson serializes large result lists several times faster than the
+        # stdlib json encoder behind Flask's jsonify.
+        return app.response_class(orjson.dumps(payload), mimetype="application/json", status=status)
+
     @app.route("/api/health")
     def health() -> tuple[str, int]:
         return "ok", 200
 
     @app.route("/api/cuisines")
-    def cuisines() -> tuple[str, int]:
-        return jsonify(sorted(recipe_graph.list_cuisines())), 200
+    def cuisines():
+        return json_response(recipe_graph.cuisines)
 
     @app.route("/api/diets")
-    def diets() -> tuple[str, int]:
-        return jsonify(sorted(recipe_graph.list_diets())), 200
+    def diets():
+        return json_response(recipe_graph.diets)
 
     @app.route("/api/search")
-    def search() -> tuple[str, int]:
+    def search():
         try:
             ingredient = request.args.get("ingredient") or None
             cuisine = request.args.get("cuisine") or None
             diet = request.args.get("diet") or None
             max_time = request.args.get("maxTime") or request.args.get("max_time")
             max_time_int = int(max_time) if max_time and max_time.isdigit() else None
+            limit_arg = request.args.get("limit")
+            limit = min(int(limit_arg), MAX_SEARCH_LIMIT) if limit_arg and limit_arg.isdigit() else DEFAULT_SEARCH_LIMIT
+            offset_arg = request.args.get("offset")
+            offset = int(offset_arg) if offset_arg and offset_arg.isdigit() else 0
+
+            logger.info(f"Search request: ingredient={ingredient}, cuisine={cuisine}, diet={diet}, max_time={max_time_int}, limit={limit}, offset={offset}")
 
-            logger.info(f"Search request: ingredient={ingredient}, cuisine={cuisine}, diet={diet}, max_time={max_time_int}")
-            
             results = recipe_graph.search(
                 ingredient=ingredient,
                 cuisine=cuisine,
                 diet=diet,
                 max_total_time=max_time_int,
+                limit=limit,
+                offset=offset,
             )
             
             logger.info(f"Search returned {len(results)} results")
-            
-            payload = []
-            for summary in results:
-                try:
-                    payload.append({
-                        "uri": summary.uri,
-                        "label": summary.label,
-                        "url": summary.url,
-                        "rating": summary.rating,
-                        "total_time": summary.total_time,
-                        "cuisines": summary.cuisines,
-                        "diets": summary.diets,
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing recipe {summary.uri}: {e}")
-                    continue
-            
-            logger.info(f"Successfully processed {len(payload)} recipes")
-            return jsonify(payload), 200
+
+            payload = [
+                {
+                    "uri": summary.uri,
+                    "label": summary.label,
+                    "url": summary.url,
+                    "rating": summary.rating,
+                    "total_time": summary.total_time,
+                    "cuisines": summary.cuisines,
+                    "diets": summary.diets,
+                }
+                for summary in results
+            ]
+            return json_response(payload)
         except Exception as e:
             logger.error(f"Search error: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return jsonify({"error": "Search failed"}), 500
+            return json_response({"error": "Search failed"}, status=500)
 
     @app.route("/api/recipes")
-    def recipe_lookup() -> tuple[str, int]:
+    def recipe_lookup():
         try:
             uri = request.args.get("uri")
             if not uri:
-                return jsonify({"error": "Missing 'uri' query parameter"}), 400
-            
+                return json_response({"error": "Missing 'uri' query parameter"}, status=400)
+
             logger.info(f"Recipe lookup request for URI: {uri}")
             detail = recipe_graph.recipe_detail(uri)
             if detail is None:
                 logger.warning(f"Recipe not found for URI: {uri}")
-                return jsonify({"error": "Recipe not found"}), 404
-            
+                return json_response({"error": "Recipe not found"}, status=404)
+
             logger.info(f"Recipe found: {detail.label}")
-            return (
-                jsonify(
-                    {
-                        "uri": detail.uri,
-                        "label": detail.label,
-                        "url": detail.url,
-                        "rating": detail.rating,
-                        "total_time": detail.total_time,
-                        "cuisines": detail.cuisines,
-                        "diets": detail.diets,
-                        "ingredients": detail.ingredients,
-                        "directions": detail.directions,
-                    }
-                ),
-                200,
+            return json_response(
+                {
+                    "uri": detail.uri,
+                    "label": detail.label,
+                    "url": detail.url,
+                    "rating": detail.rating,
+                    "total_time": detail.total_time,
+                    "cuisines": detail.cuisines,
+                    "diets": detail.diets,
+                    "ingredients": detail.ingredients,
+                    "directions": detail.directions,
+                }
             )
         except Exception as e:
             logger.error(f"Recipe lookup error: {e}")
-            return jsonify({"error": "Recipe lookup failed"}), 500
+            return json_response({"error": "Recipe lookup failed"}, status=500)
 
     @app.route("/")
     def index() -> str:
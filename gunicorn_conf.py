@@ -0,0 +1,13 @@
+"""Gunicorn configuration for serving the recipe API.
+
+Run with ``gunicorn --config gunicorn_conf.py`` (or ``python run.py serve``).
+"""
+
+bind = "0.0.0.0:8000"
+workers = 4
+
+# Load the application (and parse the knowledge graph) once in the master
+# process; forked workers then share the read-only graph through
+# copy-on-write pages instead of each paying the load cost and memory.
+preload_app = True
+wsgi_app = "app.main:create_app()"
@@ -2,6 +2,10 @@
 """
 Simple startup script for the Semantic Food Recipe Finder.
 This script ensures the data is built and starts the Flask application.
+
+Without arguments it runs Flask's single-threaded development server.
+Use `python run.py serve` to launch Gunicorn with multiple pre-forked
+workers sharing one preloaded graph (see gunicorn_conf.py).
 """
 
 import os
@@ -59,7 +63,12 @@ def main():
         print("  - data/sample_recipes.json (sample data)")
         sys.exit(1)
     
-    # Import and start the Flask app
+    # Production mode: exec Gunicorn with pre-forked workers and the graph
+    # preloaded in the master process (configuration in gunicorn_conf.py).
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        os.execvp("gunicorn", ["gunicorn", "--config", "gunicorn_conf.py"])
+
+    # Import and start the Flask app (development server)
     try:
         from app.main import create_app
         app = create_app()
